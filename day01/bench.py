@@ -0,0 +1,101 @@
+"""Time the different ways of finding the top elves on made-up inventories."""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Tuple
+
+from solve import (
+    max_elf,
+    mmap_elves,
+    parallel_top_elves,
+    read_elves,
+    stream_elves,
+    top_elves,
+    top_three_elves,
+)
+
+
+def write_inventory(filename: str, lines: int, seed: int = 2022) -> None:
+    """Write roughly `lines` lines of elves carrying 1-10 snacks each."""
+    rng = random.Random(seed)
+    written = 0
+    with open(filename, "w", encoding="utf-8") as f:
+        while written < lines:
+            snacks = rng.randint(1, 10)
+            f.write("\n".join(str(rng.randint(1000, 60000)) for _ in range(snacks)))
+            f.write("\n\n")
+            written += snacks + 1
+
+
+def list_path(filename: str) -> Tuple[int, int]:
+    elves = read_elves(filename)
+    return max_elf(elves), top_three_elves(elves)
+
+
+def mmap_path(filename: str) -> Tuple[int, int]:
+    elves = mmap_elves(filename)
+    return max_elf(elves), top_three_elves(elves)
+
+
+def stream_path(filename: str) -> Tuple[int, int]:
+    top = top_elves(stream_elves(filename), 3)
+    return top[0], sum(top)
+
+
+def parallel_path(workers: int) -> Callable[[str], Tuple[int, int]]:
+    def path(filename: str) -> Tuple[int, int]:
+        top = parallel_top_elves(filename, 3, workers)
+        return top[0], sum(top)
+
+    return path
+
+
+def time_it(
+    name: str, fn: Callable[[str], Tuple[int, int]], filename: str
+) -> Tuple[Tuple[int, int], float]:
+    start = time.perf_counter()
+    result = fn(filename)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<10} {elapsed:8.3f}s  {result}")
+    return result, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark day 1")
+    parser.add_argument(
+        "--lines",
+        type=int,
+        nargs="+",
+        default=[10**6],
+        help="sizes of inventories to make up, e.g. 1000000 100000000",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="time the sharded path with 1 up to this many processes",
+    )
+
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for lines in args.lines:
+            filename = os.path.join(tmp, f"elves-{lines}.txt")
+            write_inventory(filename, lines)
+            print(f"{lines} lines ({os.path.getsize(filename)} bytes)")
+            expected, _ = time_it("list", list_path, filename)
+            for name, fn in (("stream", stream_path), ("mmap", mmap_path)):
+                if time_it(name, fn, filename)[0] != expected:
+                    raise RuntimeError(f"{name} disagrees with list")
+            one_worker = 0.0
+            for workers in range(1, args.max_workers + 1):
+                result, elapsed = time_it(
+                    f"{workers} worker", parallel_path(workers), filename
+                )
+                if result != expected:
+                    raise RuntimeError(f"{workers} workers disagree with list")
+                one_worker = one_worker or elapsed
+                print(f"{'':24}speedup {one_worker / elapsed:.2f}x")
+            os.remove(filename)
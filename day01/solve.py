@@ -1,8 +1,23 @@
 """See the problem statement."""
 
 import argparse
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import chain
 from string import digits
-from typing import List
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+# How much of the start and end of the already-read prefix to fingerprint
+FINGERPRINT_BLOCK = 4096
+
+# The end of one line, then a line with nothing but whitespace on it (like \r)
+_blank_line_re = re.compile(rb"\n[ \t\r]*\n")
 
 
 def read_elves(filename: str) -> List[int]:
@@ -16,9 +31,212 @@ def read_elves(filename: str) -> List[int]:
             else:
                 elves.append(current_elf)
                 current_elf = 0
+    # The last elf doesn't have a blank line after it
+    if current_elf:
+        elves.append(current_elf)
     return elves
 
 
+def stream_elves(filename: str) -> Iterator[int]:
+    """Yield each elf's total one at a time, without keeping a list around."""
+    current_elf = 0
+    seen_food = False
+    with open(filename, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                current_elf += int(line)
+                seen_food = True
+            elif seen_food:
+                yield current_elf
+                current_elf = 0
+                seen_food = False
+    if seen_food:
+        yield current_elf
+
+
+def _sum_groups(buf: mmap.mmap, start: int, end: int) -> Iterator[int]:
+    """Yield the total of each blank-line-separated elf in buf[start:end]."""
+    while start < end:
+        blank = _blank_line_re.search(buf, start, end)
+        stop, after = (blank.start(), blank.end()) if blank else (end, end)
+        food = buf[start:stop].split()
+        if food:
+            yield sum(map(int, food))
+        start = after
+
+
+def mmap_elves(filename: str) -> List[int]:
+    """Same as read_elves, but works on the raw bytes of a memory-mapped file.
+
+    Each elf is the chunk between two blank lines; int() takes bytes just fine,
+    so we never decode anything to str.
+    """
+    if os.path.getsize(filename) == 0:
+        return []
+    with open(filename, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buf:
+        return list(_sum_groups(buf, 0, len(buf)))
+
+
+def shard_file(filename: str, shards: int) -> List[Tuple[int, int]]:
+    """Split a file into about `shards` byte ranges that start and end between elves.
+
+    Each range is pushed forward to just past the next blank line, so no elf
+    is ever cut in half.
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return []
+    boundaries = [0]
+    with open(filename, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buf:
+        for i in range(1, shards):
+            guess = max(size * i // shards, boundaries[-1])
+            blank = _blank_line_re.search(buf, guess)
+            if blank is None:
+                break
+            boundaries.append(blank.end())
+    boundaries.append(size)
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end
+    ]
+
+
+def _top_elves_in_shard(shard: Tuple[str, int, int, int]) -> List[int]:
+    filename, start, end, k = shard
+    with open(filename, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buf:
+        return top_elves(_sum_groups(buf, start, end), k)
+
+
+def parallel_top_elves(filename: str, k: int, workers: int) -> List[int]:
+    """Same as top_elves(stream_elves(filename), k), spread over worker processes.
+
+    Each worker finds the top k of its own shard; the overall top k has to be
+    among those, so merging them gives the exact answer.
+    """
+    shards = [
+        (filename, start, end, k) for start, end in shard_file(filename, workers)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        partials = pool.map(_top_elves_in_shard, shards)
+        return top_elves(chain.from_iterable(partials), k)
+
+
+def top_elves(elves: Iterable[int], k: int) -> List[int]:
+    """The k biggest elves, biggest first, in one pass and O(k) memory.
+
+    The first element is the same as max_elf().
+    """
+    if k < 1:
+        raise ValueError(f"Need to keep at least one elf, not {k}")
+    heap: List[int] = []
+    for elf in elves:
+        if len(heap) < k:
+            heapq.heappush(heap, elf)
+        elif elf > heap[0]:
+            heapq.heapreplace(heap, elf)
+    return sorted(heap, reverse=True)
+
+
+@dataclass
+class Checkpoint:
+    """How far we got through an append-only file, and what we found there."""
+
+    k: int
+    offset: int = 0
+    current_elf: int = 0
+    seen_food: bool = False
+    top: List[int] = field(default_factory=list)
+    fingerprint: str = ""
+
+    def read_new_elves(self, f: BinaryIO) -> Iterator[int]:
+        """Yield every elf finished after self.offset, moving the checkpoint along.
+
+        A last line with no newline yet might still be getting written, so we
+        leave it for next time.
+        """
+        f.seek(self.offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            self.offset += len(line)
+            line = line.strip()
+            if line:
+                self.current_elf += int(line)
+                self.seen_food = True
+            elif self.seen_food:
+                yield self.current_elf
+                self.current_elf = 0
+                self.seen_food = False
+
+
+def _fingerprint(f: BinaryIO, offset: int) -> str:
+    """Hash the first and last few KiB before offset.
+
+    Hashing the whole prefix would mean re-reading all of it every run, which
+    is what we're trying to avoid; any rewrite of the head of the file, or of
+    the bit we stopped at, still changes this.
+    """
+    digest = hashlib.sha256(str(offset).encode())
+    f.seek(0)
+    digest.update(f.read(min(offset, FINGERPRINT_BLOCK)))
+    tail = max(0, offset - FINGERPRINT_BLOCK)
+    f.seek(tail)
+    digest.update(f.read(offset - tail))
+    return digest.hexdigest()
+
+
+def load_checkpoint(checkpoint_filename: str, f: BinaryIO, k: int) -> Checkpoint:
+    """Load the checkpoint for f, or start over if it doesn't match the file."""
+    try:
+        with open(checkpoint_filename, encoding="utf-8") as cf:
+            checkpoint = Checkpoint(**json.load(cf))
+    except (OSError, ValueError, TypeError):
+        return Checkpoint(k=k)
+    size = os.fstat(f.fileno()).st_size
+    if (
+        checkpoint.k != k
+        or checkpoint.offset > size
+        or checkpoint.fingerprint != _fingerprint(f, checkpoint.offset)
+    ):
+        return Checkpoint(k=k)
+    return checkpoint
+
+
+def incremental_top_elves(
+    filename: str, k: int, checkpoint_filename: Optional[str] = None
+) -> List[int]:
+    """Same as top_elves(stream_elves(filename), k), but only reads what's new.
+
+    The checkpoint (by default next to the input) remembers where we stopped,
+    the elf we were in the middle of, and the top k so far.
+    """
+    if checkpoint_filename is None:
+        checkpoint_filename = filename + ".checkpoint"
+    with open(filename, "rb") as f:
+        checkpoint = load_checkpoint(checkpoint_filename, f, k)
+        checkpoint.top = top_elves(
+            chain(checkpoint.top, checkpoint.read_new_elves(f)), k
+        )
+        checkpoint.fingerprint = _fingerprint(f, checkpoint.offset)
+        # Anything past the offset is a line with no newline yet; it isn't
+        # saved in the checkpoint, but it still counts for this answer
+        f.seek(checkpoint.offset)
+        unfinished = f.read().strip()
+    with open(checkpoint_filename, "w", encoding="utf-8") as cf:
+        json.dump(asdict(checkpoint), cf)
+    # The elf we're partway through still counts if the file stops here
+    if checkpoint.seen_food or unfinished:
+        current_elf = checkpoint.current_elf + (int(unfinished) if unfinished else 0)
+        return top_elves(chain(checkpoint.top, [current_elf]), k)
+    return checkpoint.top
+
+
 def max_elf(elves: List[int]) -> int:
     return max(elves)
 
@@ -36,8 +254,47 @@ def top_three_elves(elves: List[int]) -> int:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="read the file once, keeping only the top elves in memory",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="parse the memory-mapped file as bytes instead of line by line",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="split the file into shards and sum them in this many processes",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only read what was appended since the last --incremental run",
+    )
+    parser.add_argument(
+        "-k",
+        type=int,
+        default=3,
+        help="how many elves to sum (with --stream, --workers or --incremental)",
+    )
 
     args = parser.parse_args()
-    elves = read_elves(args.filename)
-    print(max_elf(elves))
-    print(top_three_elves(elves))
+    if args.incremental:
+        top = incremental_top_elves(args.filename, args.k)
+        print(top[0])
+        print(sum(top))
+    elif args.workers:
+        top = parallel_top_elves(args.filename, args.k, args.workers)
+        print(top[0])
+        print(sum(top))
+    elif args.stream:
+        top = top_elves(stream_elves(args.filename), args.k)
+        print(top[0])
+        print(sum(top))
+    else:
+        elves = (mmap_elves if args.mmap else read_elves)(args.filename)
+        print(max_elf(elves))
+        print(top_three_elves(elves))
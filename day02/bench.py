@@ -0,0 +1,89 @@
+"""Time the different ways of scoring a made-up tournament."""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Tuple
+
+import both
+import part1
+import part2
+
+
+def write_guide(filename: str, rounds: int, seed: int = 2022) -> None:
+    rng = random.Random(seed)
+    lines = [f"{o} {p}\n" for o in "ABC" for p in "XYZ"]
+    with open(filename, "w", encoding="utf-8") as f:
+        for _ in range(0, rounds, 10000):
+            f.write("".join(rng.choices(lines, k=min(10000, rounds))))
+
+
+def separate_path(filename: str) -> Tuple[int, int]:
+    return part1.score_file(filename), part2.score_file(filename)
+
+
+def parallel_path(workers: int) -> Callable[[str], Tuple[int, int]]:
+    def path(filename: str) -> Tuple[int, int]:
+        return (
+            part1.score_file_parallel(filename, workers),
+            part2.score_file_parallel(filename, workers),
+        )
+
+    return path
+
+
+def time_it(
+    name: str, fn: Callable[[str], Tuple[int, int]], filename: str, rounds: int
+) -> Tuple[Tuple[int, int], float]:
+    start = time.perf_counter()
+    result = fn(filename)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<10} {elapsed:8.3f}s {rounds / elapsed:14,.0f} rounds/s  {result}")
+    return result, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark day 2")
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        nargs="+",
+        default=[10**6],
+        help="sizes of tournaments to make up, rounded up to 10000",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="time the --workers path with 1 up to this many processes",
+    )
+
+    args = parser.parse_args()
+    paths = [
+        ("table", both.score_file),
+        ("count", lambda filename: both.score_file(filename, count=True)),
+        ("columns", lambda filename: both.score_file(filename, columns=True)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for rounds in args.rounds:
+            filename = os.path.join(tmp, f"guide-{rounds}.txt")
+            write_guide(filename, rounds)
+            rounds = os.path.getsize(filename) // 4
+            print(f"{rounds} rounds")
+            expected, _ = time_it("separate", separate_path, filename, rounds)
+            for name, fn in paths:
+                if time_it(name, fn, filename, rounds)[0] != expected:
+                    raise RuntimeError(f"{name} disagrees with part1/part2")
+            one_worker = 0.0
+            for workers in range(1, args.max_workers + 1):
+                result, elapsed = time_it(
+                    f"{workers} worker", parallel_path(workers), filename, rounds
+                )
+                if result != expected:
+                    raise RuntimeError(f"{workers} workers disagree with part1/part2")
+                one_worker = one_worker or elapsed
+                speedup = one_worker / elapsed
+                efficiency = speedup / workers
+                print(f"{'':24}speedup {speedup:.2f}x, efficiency {efficiency:.0%}")
+            os.remove(filename)
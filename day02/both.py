@@ -0,0 +1,112 @@
+"""Score both parts at once from a table of every possible line."""
+import argparse
+from collections import Counter
+from typing import Dict, Iterable, Tuple
+
+import part1
+import part2
+
+# There are only 9 possible lines, so work out what each is worth up front.
+# table[line] = (part 1 score, part 2 score)
+table: Dict[bytes, Tuple[int, int]] = {
+    f"{opponent} {player}".encode(): (
+        part1.score_round(opponent, player),
+        part2.score_round(opponent, part2.choose_for_round(opponent, player)),
+    )
+    for opponent in (part1.ROCK, part1.PAPER, part1.SCISSORS)
+    for player in part1.player_map
+}
+
+
+def score_lines(lines: Iterable[bytes]) -> Tuple[int, int]:
+    """Total up both parts' scores in one pass."""
+    part1_score = 0
+    part2_score = 0
+    for line in lines:
+        try:
+            round1, round2 = table[line.strip()]
+        except KeyError:
+            raise ValueError(f"Could not score line {line!r}") from None
+        part1_score += round1
+        part2_score += round2
+    return part1_score, part2_score
+
+
+def score_counts(counts: Dict[bytes, int]) -> Tuple[int, int]:
+    """Score a tally of how many times each line showed up."""
+    part1_score = 0
+    part2_score = 0
+    for line, count in counts.items():
+        try:
+            round1, round2 = table[line]
+        except KeyError:
+            raise ValueError(f"Could not score line {line!r}") from None
+        part1_score += round1 * count
+        part2_score += round2 * count
+    return part1_score, part2_score
+
+
+def score_columns(data: bytes) -> Tuple[int, int]:
+    """Score a whole strategy guide at once, treating it as 4-byte rows.
+
+    Rather than pull in numpy, the "vector" is a big int with one round per
+    byte: packing the opponent and player columns lets us work out every
+    round's code 3 * opponent + player with a couple of big-int operations,
+    and then we just count each of the 9 codes.
+    """
+    if data and not data.endswith(b"\n"):
+        data += b"\n"
+    rounds = len(data) // 4
+    if len(data) % 4 or data[1::4].strip(b" ") or data[3::4].strip(b"\n"):
+        raise ValueError("Every line must look like 'A X'")
+    opponents = data[0::4]
+    players = data[2::4]
+    if opponents.translate(None, b"ABC") or players.translate(None, b"XYZ"):
+        raise ValueError("Opponents must play A, B or C and players X, Y or Z")
+    ones = int.from_bytes(b"\x01" * rounds, "big")
+    codes = (
+        3 * (int.from_bytes(opponents, "big") - ord("A") * ones)
+        + int.from_bytes(players, "big")
+        - ord("X") * ones
+    ).to_bytes(rounds, "big")
+
+    part1_score = 0
+    part2_score = 0
+    for code in range(9):
+        count = codes.count(code)
+        opponent, player = divmod(code, 3)
+        # part 1: player is what we play; win if we're one ahead of them
+        part1_score += count * (player + 1 + 3 * ((player - opponent + 1) % 3))
+        # part 2: player is the result, so we play opponent + result - 1
+        part2_score += count * (3 * player + (opponent + player - 1) % 3 + 1)
+    return part1_score, part2_score
+
+
+def score_file(
+    filename: str, count: bool = False, columns: bool = False
+) -> Tuple[int, int]:
+    with open(filename, "rb") as f:
+        if columns:
+            return score_columns(f.read())
+        if count:
+            return score_counts(Counter(f.read().splitlines()))
+        return score_lines(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="read a file")
+    parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--count",
+        action="store_true",
+        help="tally each kind of line first, then score the tally",
+    )
+    parser.add_argument(
+        "--columns",
+        action="store_true",
+        help="score the whole file at once as fixed-width columns",
+    )
+
+    args = parser.parse_args()
+    for score in score_file(args.filename, args.count, args.columns):
+        print(score)
@@ -1,6 +1,8 @@
 """See problem statement, honestly."""
 import argparse
-from typing import Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Tuple
 
 ROCK = "A"
 PAPER = "B"
@@ -37,18 +39,68 @@ def choices_from_line(line: str) -> Tuple[str, str]:
     return splits[0], splits[1]
 
 
-def score_file(filename: str) -> int:
+def score_lines(lines: Iterable[str]) -> int:
     player_score = 0
-    with open(filename, encoding="utf-8") as f:
-        for line in f:
-            opponent, player = choices_from_line(line)
-            player_score += score_round(opponent, player)
+    for line in lines:
+        opponent, player = choices_from_line(line)
+        player_score += score_round(opponent, player)
     return player_score
 
 
+def score_file(filename: str) -> int:
+    with open(filename, encoding="utf-8") as f:
+        return score_lines(f)
+
+
+def chunk_file(filename: str, chunks: int) -> List[Tuple[int, int]]:
+    """Split a file into about `chunks` byte ranges that each end on a newline."""
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, "rb") as f:
+        for i in range(1, chunks):
+            guess = max(size * i // chunks, boundaries[-1])
+            f.seek(guess)
+            # Finish off whatever line we landed in the middle of
+            f.readline()
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [
+        (start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end
+    ]
+
+
+def _score_chunk(chunk: Tuple[str, int, int, Callable[[Iterable[str]], int]]) -> int:
+    filename, start, end, scorer = chunk
+    with open(filename, "rb") as f:
+        f.seek(start)
+        return scorer(f.read(end - start).decode("utf-8").splitlines())
+
+
+def score_file_parallel(
+    filename: str,
+    workers: int,
+    scorer: Callable[[Iterable[str]], int] = score_lines,
+) -> int:
+    """Same as score_file, with the rounds split between worker processes.
+
+    Each worker runs `scorer` on its chunk's lines; part 2 passes in its own.
+    """
+    chunks = [
+        (filename, start, end, scorer) for start, end in chunk_file(filename, workers)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_score_chunk, chunks))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--workers", type=int, help="score chunks of the file in this many processes"
+    )
 
     args = parser.parse_args()
-    print(score_file(args.filename))
+    if args.workers:
+        print(score_file_parallel(args.filename, args.workers))
+    else:
+        print(score_file(args.filename))
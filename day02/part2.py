@@ -1,6 +1,8 @@
 """See problem statement, honestly."""
 import argparse
-from typing import Tuple
+from typing import Iterable, Tuple
+
+import part1
 
 ROCK = "A"
 PAPER = "B"
@@ -53,19 +55,34 @@ def choices_from_line(line: str) -> Tuple[str, str]:
     return splits[0], splits[1]
 
 
-def score_file(filename: str) -> int:
+def score_lines(lines: Iterable[str]) -> int:
     player_score = 0
-    with open(filename, encoding="utf-8") as f:
-        for line in f:
-            opponent, result = choices_from_line(line)
-            player_choice = choose_for_round(opponent, result)
-            player_score += score_round(opponent, player_choice)
+    for line in lines:
+        opponent, result = choices_from_line(line)
+        player_choice = choose_for_round(opponent, result)
+        player_score += score_round(opponent, player_choice)
     return player_score
 
 
+def score_file(filename: str) -> int:
+    with open(filename, encoding="utf-8") as f:
+        return score_lines(f)
+
+
+def score_file_parallel(filename: str, workers: int) -> int:
+    """Same as score_file, with the rounds split between worker processes."""
+    return part1.score_file_parallel(filename, workers, score_lines)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--workers", type=int, help="score chunks of the file in this many processes"
+    )
 
     args = parser.parse_args()
-    print(score_file(args.filename))
+    if args.workers:
+        print(score_file_parallel(args.filename, args.workers))
+    else:
+        print(score_file(args.filename))
@@ -0,0 +1,56 @@
+"""Do both parts in one pass, looking at each rucksack line just once."""
+
+import argparse
+from typing import Iterable, Tuple
+
+from part1 import compartment_masks, mask_priority
+from part2 import first_item
+
+
+def prioritize_lines(lines: Iterable[bytes]) -> Tuple[int, int]:
+    """Get both parts' answers, keeping only the current group's mask around.
+
+    Each line's compartment masks give part 1 (front & back) and that sack's
+    contribution to its group's badge (front | back). Only the group's first
+    line is kept, in case its sacks share more than one item.
+    """
+    sack_total = 0
+    group_total = 0
+    group_mask = 0
+    sacks_in_group = 0
+    first_sack = b""
+    for line in lines:
+        sack = line.strip()
+        front, back = compartment_masks(sack)
+        sack_total += mask_priority(front & back)
+        sack_mask = front | back
+        if sacks_in_group:
+            group_mask &= sack_mask
+        else:
+            group_mask = sack_mask
+            first_sack = sack
+        sacks_in_group += 1
+        if sacks_in_group == 3:
+            if not group_mask:
+                raise RuntimeError("This group has no badge :(")
+            if group_mask & (group_mask - 1):
+                group_mask = first_item(first_sack, group_mask)
+            group_total += group_mask.bit_length()
+            sacks_in_group = 0
+    if sacks_in_group:
+        raise ValueError("The last group doesn't have 3 rucksacks")
+    return sack_total, group_total
+
+
+def prioritize_file(filename: str) -> Tuple[int, int]:
+    with open(filename, "rb") as f:
+        return prioritize_lines(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="read a file")
+    parser.add_argument("filename")  # positional argument
+
+    args = parser.parse_args()
+    for total in prioritize_file(args.filename):
+        print(total)
@@ -3,21 +3,57 @@
 import argparse
 from dataclasses import dataclass, field
 from string import ascii_lowercase, ascii_uppercase
-from typing import List, Set
+from typing import Iterable, Iterator, List, Tuple
 
 
-def priority(item: str) -> int:
-    """Get priority of an item."""
-    if len(item) != 1:
-        raise ValueError("Item should be exactly one character")
-    if item in ascii_lowercase:
-        # values are 1 through 26
-        return ascii_lowercase.index(item) + 1
-    elif item in ascii_uppercase:
-        # values are 27 through 52
-        return ascii_uppercase.index(item) + 27
-    else:
-        raise ValueError(f"{item} is not a letter")
+# Every item gets one bit of a 52-bit mask: the item with priority p is bit p - 1
+ITEMS = (ascii_lowercase + ascii_uppercase).encode()
+ITEM_BITS = [0] * 256
+for _bit, _item in enumerate(ITEMS):
+    ITEM_BITS[_item] = 1 << _bit
+
+
+def item_mask(items: bytes) -> int:
+    """Get a mask with a bit set for each kind of item in `items`."""
+    if items.translate(None, ITEMS):
+        raise ValueError(f"{items!r} contains something that isn't a letter")
+    mask = 0
+    for item in items:
+        mask |= ITEM_BITS[item]
+    return mask
+
+
+def mask_priority(mask: int) -> int:
+    """Get the sum of the priorities of the items in a mask."""
+    total = 0
+    while mask:
+        lowest = mask & -mask
+        total += lowest.bit_length()
+        mask ^= lowest
+    return total
+
+
+def compartment_masks(sack: bytes) -> Tuple[int, int]:
+    """Get the item masks of the front and back of a rucksack's line."""
+    if len(sack) % 2 != 0:
+        raise ValueError(
+            "Rucksack must contain the same number of items in its front and back"
+            " compartments"
+        )
+    half_len = len(sack) // 2
+    return item_mask(sack[:half_len]), item_mask(sack[half_len:])
+
+
+def sack_priority(sack: bytes) -> int:
+    """Get the priority of a rucksack, straight from its line of the file."""
+    front, back = compartment_masks(sack)
+    return mask_priority(front & back)
+
+
+def sack_priorities(lines: Iterable[bytes]) -> Iterator[int]:
+    """Lazily yield the priority of each rucksack line."""
+    for line in lines:
+        yield sack_priority(line.strip())
 
 
 @dataclass(frozen=True)
@@ -42,13 +78,14 @@ class Rucksack:
         half_len = int(len(sack) / 2)
         return cls(sack[:half_len], sack[half_len:])
 
+    def shared_mask(self) -> int:
+        """Get a mask of the item(s) that are in both compartments."""
+        return item_mask(self.front.encode()) & item_mask(self.back.encode())
+
     def shared_item(self) -> List[str]:
         """Get the item(s) that are in both compartments."""
-        shared: Set[str] = set()
-        for item in self.front:
-            if item in self.back:
-                shared.add(item)
-        return list(shared)
+        shared = self.shared_mask()
+        return [chr(item) for bit, item in enumerate(ITEMS) if shared >> bit & 1]
 
     def priority(self) -> int:
         """Get the priority of this rucksack.
@@ -56,26 +93,29 @@ class Rucksack:
         A priority is the sum of the priorities of the items that are shared
         between both compartments.
         """
-        return sum(priority(e) for e in self.shared_item())
+        return mask_priority(self.shared_mask())
 
 
-def sacks_from_file(filename: str) -> List[Rucksack]:
-    sacks: List[Rucksack] = []
+def sacks_from_file(filename: str) -> Iterator[Rucksack]:
     with open(filename) as f:
         for line in f:
-            sacks.append(Rucksack.from_sack(line.strip()))
-    return sacks
+            yield Rucksack.from_sack(line.strip())
 
 
-def prioritize_sacks(sacks: List[Rucksack]) -> int:
+def prioritize_sacks(sacks: Iterable[Rucksack]) -> int:
     """Get the sum of the priorities of all 'shared' items across rucksacks."""
     return sum(s.priority() for s in sacks)
 
 
+def prioritize_file(filename: str) -> int:
+    """Same as prioritize_sacks(sacks_from_file(filename)), working on bytes."""
+    with open(filename, "rb") as f:
+        return sum(sack_priorities(f))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
 
     args = parser.parse_args()
-    sacks = sacks_from_file(args.filename)
-    print(prioritize_sacks(sacks))
+    print(prioritize_file(args.filename))
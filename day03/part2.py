@@ -3,22 +3,9 @@
 import argparse
 from dataclasses import dataclass, field
 from itertools import islice
-from string import ascii_lowercase, ascii_uppercase
-from typing import List, Set
+from typing import Iterable, Iterator
 
-
-def priority(item: str) -> int:
-    """Get priority of an item."""
-    if len(item) != 1:
-        raise ValueError("Item should be exactly one character")
-    if item in ascii_lowercase:
-        # values are 1 through 26
-        return ascii_lowercase.index(item) + 1
-    elif item in ascii_uppercase:
-        # values are 27 through 52
-        return ascii_uppercase.index(item) + 27
-    else:
-        raise ValueError(f"{item} is not a letter")
+from part1 import ITEM_BITS, ITEMS, item_mask
 
 
 @dataclass(frozen=True)
@@ -33,19 +20,46 @@ class Group:
     sack2: str
     sack3: str
 
+    def badge_mask(self) -> int:
+        """Get a mask with just this group's badge set."""
+        return badge_mask(
+            self.sack1.strip().encode(),
+            self.sack2.strip().encode(),
+            self.sack3.strip().encode(),
+        )
+
     def badge(self) -> str:
         """Get badge for this group.
 
         A group's badge is the item shared between all 3 sacks.
         """
-        for item in self.sack1:
-            if item in self.sack2 and item in self.sack3:
-                return item
-        raise RuntimeError("This group has no badge :(")
+        return chr(ITEMS[self.priority() - 1])
 
     def priority(self) -> int:
         """Get priority for this group."""
-        return priority(self.badge())
+        return self.badge_mask().bit_length()
+
+
+def first_item(sack: bytes, mask: int) -> int:
+    """Get a mask of whichever item in `mask` comes first in `sack`."""
+    for item in sack:
+        if ITEM_BITS[item] & mask:
+            return ITEM_BITS[item]
+    raise ValueError(f"{sack!r} has none of those items")
+
+
+def badge_mask(sack1: bytes, sack2: bytes, sack3: bytes) -> int:
+    """Get a mask with just the badge of these 3 sacks set.
+
+    If the sacks share more than one item, the one that comes first in sack1
+    is the badge.
+    """
+    shared = item_mask(sack1) & item_mask(sack2) & item_mask(sack3)
+    if not shared:
+        raise RuntimeError("This group has no badge :(")
+    if shared & (shared - 1):
+        return first_item(sack1, shared)
+    return shared
 
 
 def batch3(iterable):
@@ -58,23 +72,32 @@ def batch3(iterable):
         yield batch
 
 
-def groups_from_file(filename: str) -> List[Group]:
-    groups: List[Group] = []
+def groups_from_file(filename: str) -> Iterator[Group]:
     with open(filename) as f:
         for sack1, sack2, sack3 in batch3(f):
-            groups.append(Group(sack1, sack2, sack3))
-    return groups
+            yield Group(sack1, sack2, sack3)
 
 
-def prioritize_groups(groups: List[Group]) -> int:
+def prioritize_groups(groups: Iterable[Group]) -> int:
     """Get the sum of the priorities of the groups."""
     return sum(g.priority() for g in groups)
 
 
+def group_priorities(lines: Iterable[bytes]) -> Iterator[int]:
+    """Lazily yield the priority of each group of 3 rucksack lines."""
+    for sack1, sack2, sack3 in batch3(lines):
+        yield badge_mask(sack1.strip(), sack2.strip(), sack3.strip()).bit_length()
+
+
+def prioritize_file(filename: str) -> int:
+    """Same as prioritize_groups(groups_from_file(filename)), without the Groups."""
+    with open(filename, "rb") as f:
+        return sum(group_priorities(f))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
 
     args = parser.parse_args()
-    groups = groups_from_file(args.filename)
-    print(prioritize_groups(groups))
+    print(prioritize_file(args.filename))
@@ -0,0 +1,93 @@
+"""Time the different ways of counting made-up assignment pairs."""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Tuple
+
+from index import ElfIndex
+from solve import Elf, count_both, count_both_columns, count_overlaps, count_reconsiders
+
+
+def write_pairs(filename: str, pairs: int, seed: int = 2022) -> None:
+    rng = random.Random(seed)
+    with open(filename, "w", encoding="utf-8") as f:
+        for _ in range(pairs):
+            start1, end1 = sorted(rng.randint(1, 99) for _ in range(2))
+            start2, end2 = sorted(rng.randint(1, 99) for _ in range(2))
+            f.write(f"{start1}-{end1},{start2}-{end2}\n")
+
+
+def two_pass_path(filename: str) -> Tuple[int, int]:
+    return count_reconsiders(filename), count_overlaps(filename)
+
+
+def time_it(
+    name: str, fn: Callable[[str], Tuple[int, int]], filename: str
+) -> Tuple[int, int]:
+    start = time.perf_counter()
+    result = fn(filename)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<10} {elapsed:8.3f}s  {result}")
+    return result
+
+
+def bench_index(filename: str, queries: int, seed: int = 2022) -> None:
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    index = ElfIndex.from_file(filename)
+    elapsed = time.perf_counter() - start
+    print(f"  {'build':<10} {elapsed:8.3f}s  {len(index.elves)} elves")
+
+    ranges = [sorted(rng.randint(1, 99) for _ in range(2)) for _ in range(queries)]
+    start = time.perf_counter()
+    found = sum(len(list(index.overlapping(a, b))) for a, b in ranges)
+    print(f"  {'queries':<10} {time.perf_counter() - start:8.3f}s  {found} found")
+    start = time.perf_counter()
+    scanned = sum(
+        sum(elf.overlaps(Elf(a, b)) for elf in index.elves) for a, b in ranges
+    )
+    print(f"  {'scan':<10} {time.perf_counter() - start:8.3f}s  {scanned} found")
+    if scanned != found:
+        raise RuntimeError("index disagrees with scanning")
+
+    start = time.perf_counter()
+    pairs = index.count_overlapping_pairs()
+    print(f"  {'all pairs':<10} {time.perf_counter() - start:8.3f}s  {pairs}")
+    few = ElfIndex(index.elves[:2000])
+    start = time.perf_counter()
+    brute = sum(
+        a.overlaps(b) for i, a in enumerate(few.elves) for b in few.elves[i + 1 :]
+    )
+    print(f"  {'brute 2000':<10} {time.perf_counter() - start:8.3f}s  {brute}")
+    if brute != few.count_overlapping_pairs():
+        raise RuntimeError("index disagrees with checking every pair")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark day 4")
+    parser.add_argument(
+        "--pairs",
+        type=int,
+        nargs="+",
+        default=[10**6],
+        help="numbers of assignment pairs to make up",
+    )
+    parser.add_argument(
+        "--queries", type=int, default=100, help="overlap queries to time"
+    )
+
+    args = parser.parse_args()
+    paths = [("one pass", count_both), ("columns", count_both_columns)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for pairs in args.pairs:
+            filename = os.path.join(tmp, f"pairs-{pairs}.txt")
+            write_pairs(filename, pairs)
+            print(f"{pairs} pairs")
+            expected = time_it("two pass", two_pass_path, filename)
+            for name, fn in paths:
+                if time_it(name, fn, filename) != expected:
+                    raise RuntimeError(f"{name} disagrees with two pass")
+            bench_index(filename, args.queries)
+            os.remove(filename)
@@ -0,0 +1,141 @@
+"""Answer questions about every elf's assignment in a file at once."""
+from __future__ import annotations
+
+import argparse
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from solve import Assignments, Elf
+
+
+@dataclass
+class _Node:
+    """One node of a centered interval tree.
+
+    The node holds (the indices of) every elf whose assignment covers
+    `center`; elves entirely before it go left and entirely after it go right.
+    """
+
+    center: int
+    # Sorted by start, smallest first
+    by_start: List[int]
+    # Sorted by end, biggest first
+    by_end: List[int]
+    left: Optional[_Node] = None
+    right: Optional[_Node] = None
+
+
+class ElfIndex:
+    """An interval tree over elves' assignments.
+
+    Queries yield indices into `elves`, so for a file's elves, elf 2i and
+    elf 2i + 1 are the two elves on line i.
+    """
+
+    def __init__(self, elves: List[Elf]):
+        self.elves = elves
+        self.root = self._build(list(range(len(elves))))
+
+    @classmethod
+    def from_file(cls, filename: str) -> ElfIndex:
+        assignments = Assignments.from_file(filename)
+        elves: List[Elf] = []
+        for start1, end1, start2, end2 in zip(
+            assignments.start1, assignments.end1, assignments.start2, assignments.end2
+        ):
+            elves.append(Elf(start1, end1))
+            elves.append(Elf(start2, end2))
+        return cls(elves)
+
+    def _build(self, indices: List[int]) -> Optional[_Node]:
+        if not indices:
+            return None
+        elves = self.elves
+        endpoints = sorted(
+            [elves[i].start for i in indices] + [elves[i].end for i in indices]
+        )
+        # The median endpoint belongs to some elf, so no node is ever empty
+        center = endpoints[len(endpoints) // 2]
+        left = [i for i in indices if elves[i].end < center]
+        right = [i for i in indices if elves[i].start > center]
+        here = [i for i in indices if elves[i].start <= center <= elves[i].end]
+        return _Node(
+            center,
+            sorted(here, key=lambda i: elves[i].start),
+            sorted(here, key=lambda i: elves[i].end, reverse=True),
+            self._build(left),
+            self._build(right),
+        )
+
+    def overlapping(self, start: int, end: int) -> Iterator[int]:
+        """Yield every elf whose assignment overlaps sections start-end.
+
+        Takes O(log n + k) for k matching elves.
+        """
+        elves = self.elves
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end < node.center:
+                # Everything here ends after `end`; it's in if it starts in time
+                for i in node.by_start:
+                    if elves[i].start > end:
+                        break
+                    yield i
+            elif start > node.center:
+                # Everything here starts before `start`; it's in if it ends late
+                for i in node.by_end:
+                    if elves[i].end < start:
+                        break
+                    yield i
+            else:
+                yield from node.by_start
+            if start < node.center:
+                stack.append(node.left)
+            if end > node.center:
+                stack.append(node.right)
+
+    def covering(self, section: int) -> Iterator[int]:
+        """Yield every elf whose assignment includes this section."""
+        return self.overlapping(section, section)
+
+    def count_overlapping_pairs(self) -> int:
+        """How many pairs of elves (from anywhere in the file) overlap.
+
+        Two elves don't overlap exactly when one ends before the other starts,
+        so count those with a binary search per elf and take them away from
+        all the pairs. O(n log n) instead of checking every pair.
+        """
+        ends = sorted(elf.end for elf in self.elves)
+        apart = sum(bisect_left(ends, elf.start) for elf in self.elves)
+        n = len(self.elves)
+        return n * (n - 1) // 2 - apart
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="query a file's assignments")
+    parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--covering", type=int, help="list elves whose assignment has this section"
+    )
+    parser.add_argument(
+        "--overlapping",
+        type=int,
+        nargs=2,
+        metavar=("START", "END"),
+        help="list elves whose assignment overlaps START-END",
+    )
+
+    args = parser.parse_args()
+    index = ElfIndex.from_file(args.filename)
+    if args.covering is not None:
+        for i in sorted(index.covering(args.covering)):
+            print(i, index.elves[i])
+    elif args.overlapping is not None:
+        for i in sorted(index.overlapping(*args.overlapping)):
+            print(i, index.elves[i])
+    else:
+        print(index.count_overlapping_pairs())
@@ -3,7 +3,15 @@ from __future__ import annotations
 
 import argparse
 import re
+from array import array
 from dataclasses import dataclass
+from operator import and_, ge, le, or_
+from typing import Iterator, Tuple
+
+# Turns "2-4,6-8" into "2 4 6 8" so a whole file splits into plain numbers
+SEPARATORS_TO_SPACES = bytes.maketrans(b"-,", b"  ")
+# How much of a file to load into columns at a time
+CHUNK_SIZE = 1 << 20
 
 
 @dataclass(frozen=True)
@@ -47,6 +55,81 @@ class Pair:
         return self.elf1.overlaps(self.elf2)
 
 
+@dataclass(frozen=True)
+class Assignments:
+    """Every pair in a file, stored as one array per column.
+
+    The methods work on whole columns at once (map() over operator functions
+    runs the loop in C), yielding one bool per pair in file order.
+    """
+
+    start1: array
+    end1: array
+    start2: array
+    end2: array
+
+    @classmethod
+    def from_file(cls, filename: str) -> Assignments:
+        """Load a file a chunk of whole lines at a time.
+
+        Only one chunk's worth of split-out numbers exists at once, so the
+        memory used is mostly the arrays themselves.
+        """
+        assignments = cls(array("q"), array("q"), array("q"), array("q"))
+        columns = (
+            assignments.start1,
+            assignments.end1,
+            assignments.start2,
+            assignments.end2,
+        )
+        leftover = b""
+        with open(filename, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                # Hold back the line we're partway through for the next chunk
+                cut = chunk.rfind(b"\n") + 1
+                if cut == 0:
+                    leftover += chunk
+                    continue
+                lines = leftover + chunk[:cut]
+                leftover = chunk[cut:]
+                assignments._extend(lines, columns, filename)
+        assignments._extend(leftover, columns, filename)
+        return assignments
+
+    @staticmethod
+    def _extend(lines: bytes, columns: Tuple[array, ...], filename: str):
+        numbers = array("q", map(int, lines.translate(SEPARATORS_TO_SPACES).split()))
+        if len(numbers) % 4 != 0:
+            raise ValueError(f"{filename} doesn't have 4 numbers on every line")
+        for i, column in enumerate(columns):
+            column.extend(numbers[i::4])
+
+    def __len__(self) -> int:
+        return len(self.start1)
+
+    def contains(self) -> Iterator[bool]:
+        """Whether each first elf's assignment fully contains the second's."""
+        return map(
+            and_, map(le, self.start1, self.start2), map(ge, self.end1, self.end2)
+        )
+
+    def contained(self) -> Iterator[bool]:
+        """Whether each second elf's assignment fully contains the first's."""
+        return map(
+            and_, map(le, self.start2, self.start1), map(ge, self.end2, self.end1)
+        )
+
+    def reconsider(self) -> Iterator[bool]:
+        """Whether to reconsider each pair, like Pair.reconsider."""
+        return map(or_, self.contains(), self.contained())
+
+    def overlaps(self) -> Iterator[bool]:
+        """Whether each pair overlaps, like Pair.overlaps."""
+        return map(
+            and_, map(le, self.start1, self.end2), map(le, self.start2, self.end1)
+        )
+
+
 def count_reconsiders(filename: str) -> int:
     """How many pairs in this file need reconsidering."""
     assignment_re = re.compile(r"(\d+)-(\d+),(\d+)-(\d+)")
@@ -87,10 +170,44 @@ def count_overlaps(filename: str) -> int:
     return count
 
 
+def count_both(filename: str) -> Tuple[int, int]:
+    """count_reconsiders and count_overlaps in one pass, without the dataclasses."""
+    assignment_re = re.compile(r"(\d+)-(\d+),(\d+)-(\d+)")
+    reconsiders = 0
+    overlaps = 0
+    with open(filename) as f:
+        for line in f:
+            m = assignment_re.search(line)
+            if m is None:
+                raise ValueError(
+                    f"Not able to make pair from {line} in file {filename}"
+                )
+            start1, end1, start2, end2 = map(int, m.groups())
+            if (start1 <= start2 and end1 >= end2) or (
+                start2 <= start1 and end2 >= end1
+            ):
+                reconsiders += 1
+            if start1 <= end2 and start2 <= end1:
+                overlaps += 1
+    return reconsiders, overlaps
+
+
+def count_both_columns(filename: str) -> Tuple[int, int]:
+    """Same as count_both, but loads the whole file into columns first."""
+    assignments = Assignments.from_file(filename)
+    return sum(assignments.reconsider()), sum(assignments.overlaps())
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--columns",
+        action="store_true",
+        help="load the whole file into columns and count them all at once",
+    )
 
     args = parser.parse_args()
-    print(count_reconsiders(args.filename))
-    print(count_overlaps(args.filename))
+    count_pairs = count_both_columns if args.columns else count_both
+    for count in count_pairs(args.filename):
+        print(count)
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import argparse
 import re
-from dataclasses import dataclass
+import zlib
+from dataclasses import dataclass, field
 from itertools import islice
 from string import ascii_lowercase, ascii_uppercase
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Sequence, TextIO, Tuple
 
 _op_str_re = re.compile(r"move (\d+) from (\d+) to (\d+)")
 
@@ -44,17 +45,84 @@ class Op:
         )
 
 
+def move_crates(stacks: List[List[str]], op: Op, keep_order: bool = False):
+    """Move all of op's crates at once, with one slice, del and extend.
+
+    The CrateMover 9000 (part 1) moves crates one at a time, so they land in
+    reverse order; the CrateMover 9001 (part 2) keeps them in order.
+    """
+    # zero-indexing vs one-indexing
+    source = stacks[op.where_from - 1]
+    if op.how_many == 0:
+        return
+    if op.how_many > len(source):
+        raise IndexError(
+            f"Can't move {op.how_many} crates from a stack of {len(source)}"
+        )
+    if op.where_from == op.where_to:
+        # Either crane just puts the crates back where they were
+        return
+    crates = source[-op.how_many :]
+    del source[-op.how_many :]
+    if not keep_order:
+        crates.reverse()
+    stacks[op.where_to - 1].extend(crates)
+
+
+def message_backward(
+    stacks: List[List[str]], ops: Sequence[Op], keep_order: bool = False
+) -> str:
+    """Get the message after doing ops to stacks, without moving any crates.
+
+    A forward pass only tracks how tall each stack is. Then, for each spot
+    that ends up on top of a stack, go back through the ops to find where
+    the crate in that spot started out. That's O(stacks * ops), however many
+    crates get moved. `stacks` isn't changed.
+    """
+    heights = [len(stack) for stack in stacks]
+    for op in ops:
+        if op.how_many > heights[op.where_from - 1]:
+            raise IndexError(
+                f"Can't move {op.how_many} crates from a stack of"
+                f" {heights[op.where_from - 1]}"
+            )
+        heights[op.where_from - 1] -= op.how_many
+        heights[op.where_to - 1] += op.how_many
+
+    # (stack, index from the bottom) of each crate that ends up on top
+    spots = [[i, height - 1] for i, height in enumerate(heights) if height]
+    for op in reversed(ops):
+        where_from = op.where_from - 1
+        where_to = op.where_to - 1
+        if where_from == where_to:
+            # Moving crates onto the same stack leaves it as it was
+            continue
+        # Heights as they were just before this op
+        heights[where_from] += op.how_many
+        heights[where_to] -= op.how_many
+        from_height = heights[where_from]
+        to_height = heights[where_to]
+        for spot in spots:
+            stack, index = spot
+            if stack != where_to or index < to_height:
+                # This crate didn't move
+                continue
+            # It's the j-th crate (from the bottom) of the ones that got moved
+            j = index - to_height
+            spot[0] = where_from
+            if keep_order:
+                spot[1] = from_height - op.how_many + j
+            else:
+                spot[1] = from_height - 1 - j
+    return "".join(stacks[stack][index] for stack, index in spots)
+
+
 @dataclass
 class Crane:
     stacks: List[List[str]]
 
     def do(self, op: Op):
-        # zero-indexing vs one-indexing
-        where_from = op.where_from - 1
-        where_to = op.where_to - 1
-        for _ in range(op.how_many):
-            crate = self.stacks[where_from].pop()
-            self.stacks[where_to].append(crate)
+        move_crates(self.stacks, op)
 
     def pretty(self) -> str:
         longest_stack = max(len(s) for s in self.stacks)
@@ -87,28 +155,41 @@ class Crane:
         return out
 
 
+def read_drawing(f: TextIO) -> Crane:
+    """Read the drawing from the top of an open file, up to the blank line.
+
+    The file is left just past the blank line, where the ops start.
+    """
+    rows: List[str] = []
+    for line in f:
+        if line.strip() == "":
+            break
+        rows.append(line)
+    if not rows:
+        raise ValueError("There's no drawing of the stacks")
+    # The last row of the drawing numbers the stacks, so that's how many there are
+    stacks: List[List[str]] = [[] for _ in rows.pop().split()]
+    for row in reversed(rows):
+        # Let's be real: we could look for those square braces
+        # or we could just split the crane platform into groups of 4 characters.
+        for i, batch in enumerate(batched(row, 4)):
+            for char in batch:
+                if char in ascii_uppercase:
+                    stacks[i].append(char)
+    return Crane(stacks)
+
+
 def crane_from_file(filename: str) -> Crane:
     """Read crane from file."""
-    # Python doesn't have do/while so I'm going to use my secret knowledge
-    # that i got from reading the input file:
-    # there are 9 stacks
-    stacks: List[List[str]] = []
-    for _ in range(0, 9):
-        stacks.append([])
-
     with open(filename) as f:
-        for line in f:
-            if line.strip() == "":
-                break
-            # Let's be real: we could look for those square braces
-            # or we could just split the crane platform into groups of 4 characters.
-            for i, batch in enumerate(batched(line, 4)):
-                for char in batch:
-                    if char in ascii_uppercase:
-                        stacks[i].append(char)
-    for stack in stacks:
-        stack.reverse()
-    return Crane(stacks)
+        return read_drawing(f)
+
+
+def ops_from_lines(lines: Iterable[str]) -> Iterator[Op]:
+    """Lazily read operations, skipping any blank lines."""
+    for line in lines:
+        if line.strip() != "":
+            yield Op.from_str(line)
 
 
 def ops_from_file(filename: str) -> List[Op]:
@@ -119,21 +200,102 @@ def ops_from_file(filename: str) -> List[Op]:
         while line.strip() != "":
             line = f.readline()
         # Here is where the ops start
-        return [Op.from_str(line) for line in f]
+        return list(ops_from_lines(f))
 
 
 def do_file(filename: str) -> str:
-    """Make a crane, operate the whole file, get the message."""
-    crane = crane_from_file(filename)
-    ops = ops_from_file(filename)
-    for o in ops:
-        crane.do(o)
+    """Make a crane, operate the whole file, get the message.
+
+    This reads the file once, doing each op as soon as it's read.
+    """
+    with open(filename) as f:
+        crane = read_drawing(f)
+        for o in ops_from_lines(f):
+            crane.do(o)
     return crane.message()
 
 
+def pack_stacks(stacks: List[List[str]]) -> bytes:
+    """Squash stacks down to compressed bytes: one byte per crate."""
+    return zlib.compress(b"\0".join("".join(stack).encode() for stack in stacks))
+
+
+def unpack_stacks(packed: bytes) -> List[List[str]]:
+    """Undo pack_stacks."""
+    return [list(stack.decode()) for stack in zlib.decompress(packed).split(b"\0")]
+
+
+@dataclass
+class Replay:
+    """A crane and its ops, for looking at the stacks after any number of ops.
+
+    Every `every` ops we keep a packed snapshot of the stacks, so getting the
+    state after op n only means replaying fewer than `every` ops.
+    """
+
+    start: Crane
+    ops: List[Op]
+    keep_order: bool = False
+    every: int = 1000
+    # snapshots[i] is the stacks after i * every ops
+    snapshots: List[bytes] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.every < 1:
+            raise ValueError("Need to snapshot at least every op")
+        if not self.snapshots:
+            self.snapshots.append(pack_stacks(self.start.stacks))
+
+    @classmethod
+    def from_file(cls, filename: str, keep_order: bool = False, every: int = 1000):
+        with open(filename) as f:
+            crane = read_drawing(f)
+            ops = list(ops_from_lines(f))
+        return cls(crane, ops, keep_order, every)
+
+    def state_at(self, n: int) -> Crane:
+        """Get the crane after the first n ops."""
+        if not 0 <= n <= len(self.ops):
+            raise IndexError(f"There are only {len(self.ops)} ops, not {n}")
+        snapshot = min(n // self.every, len(self.snapshots) - 1)
+        stacks = unpack_stacks(self.snapshots[snapshot])
+        done = snapshot * self.every
+        while done < n:
+            move_crates(stacks, self.ops[done], self.keep_order)
+            done += 1
+            # Snapshots are taken lazily, the first time we go past one
+            if done == len(self.snapshots) * self.every:
+                self.snapshots.append(pack_stacks(stacks))
+        return Crane(stacks)
+
+
+def do_file_backward(filename: str, keep_order: bool = False) -> str:
+    """Same as do_file, but using message_backward instead of moving crates."""
+    with open(filename) as f:
+        crane = read_drawing(f)
+        ops = list(ops_from_lines(f))
+    return message_backward(crane.stacks, ops, keep_order)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--backward",
+        action="store_true",
+        help="work out just the top crates by tracing back through the ops",
+    )
+    parser.add_argument(
+        "--state-at",
+        type=int,
+        metavar="N",
+        help="draw the stacks as they are after the first N ops",
+    )
 
     args = parser.parse_args()
-    print(do_file(args.filename))
+    if args.state_at is not None:
+        print(Replay.from_file(args.filename).state_at(args.state_at).pretty())
+    elif args.backward:
+        print(do_file_backward(args.filename))
+    else:
+        print(do_file(args.filename))
@@ -0,0 +1,77 @@
+"""Time finding markers in made-up datastreams."""
+import argparse
+import random
+import time
+from string import ascii_lowercase
+from typing import Callable, List
+
+from part1 import find_window, find_window_mask
+
+
+def find_window_with_sets(s: str, width: int) -> int:
+    """The old way: keep a list of the last few characters and make a set."""
+    prev_chars: List[str] = []
+    for i, e in enumerate(s):
+        prev_chars.append(e)
+        if len(prev_chars) < width:
+            continue
+        prev_chars = prev_chars[-width:]
+        if len(set(prev_chars)) == width:
+            return i + 1
+    raise ValueError(f"no unique set of {width} consecutive characters in string")
+
+
+def make_stream(chars: int, width: int) -> str:
+    """A stream where the only marker is right at the end.
+
+    Cycling through width - 1 letters means every window has exactly one
+    repeat, which is about as bad as it gets.
+    """
+    cycle = ascii_lowercase[: width - 1]
+    body = cycle * ((chars - width) // len(cycle))
+    return body + ascii_lowercase[-width:]
+
+
+def make_random_stream(chars: int, width: int, seed: int = 2022) -> str:
+    """Like make_stream, but the width - 1 letters come in a random order."""
+    rng = random.Random(seed)
+    body = "".join(rng.choices(ascii_lowercase[: width - 1], k=chars - width))
+    return body + ascii_lowercase[-width:]
+
+
+def time_it(name: str, fn: Callable[[str, int], int], s: str, width: int) -> int:
+    start = time.perf_counter()
+    result = fn(s, width)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<10} {elapsed:8.3f}s {len(s) / elapsed:14,.0f} chars/s  {result}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark day 6")
+    parser.add_argument(
+        "--chars",
+        type=int,
+        nargs="+",
+        default=[10**7],
+        help="lengths of datastreams to make up, e.g. 1000000000",
+    )
+    parser.add_argument(
+        "--skip-sets",
+        action="store_true",
+        help="don't time the old list-and-set way, which is slow",
+    )
+
+    args = parser.parse_args()
+    paths = [("window", find_window), ("mask", find_window_mask)]
+    if not args.skip_sets:
+        paths.insert(0, ("sets", find_window_with_sets))
+    streams = [("cycling", make_stream), ("random", make_random_stream)]
+    for chars in args.chars:
+        for width in (4, 14):
+            for kind, make in streams:
+                s = make(chars, width)
+                print(f"{len(s)} {kind} chars, width {width}")
+                results = {time_it(name, fn, s, width) for name, fn in paths}
+                if len(results) != 1:
+                    raise RuntimeError(f"paths disagree: {results}")
@@ -1,29 +1,103 @@
 import argparse
-from typing import List
+from functools import partial
+from typing import BinaryIO, Dict, Iterable, List, Union
 
 
-def find_marker(s: str) -> int:
-    prev_chars: List[str] = []
-    for i, e in enumerate(s):
-        if len(prev_chars) < 4:
-            prev_chars.append(e)
-            continue
-        prev_chars.append(e)
-        prev_chars = prev_chars[1:]
-        if len(set(prev_chars)) == 4:
-            return i + 1
-    raise ValueError("no unique set of 4 consecutive characters in string")
+# How much of a file to read at a time
+CHUNK_SIZE = 1 << 20
+
+Datastream = Union[str, bytes, BinaryIO, Iterable[bytes]]
+
+
+def chunks_of(stream: Datastream) -> Iterable[Union[str, bytes]]:
+    """Turn a datastream into chunks; a str or bytes is just one big chunk."""
+    if isinstance(stream, (str, bytes)):
+        return [stream]
+    if hasattr(stream, "read"):
+        # read(0) is b"" for binary files and "" for text ones
+        return iter(partial(stream.read, CHUNK_SIZE), stream.read(0))
+    return stream
+
+
+def find_window(stream: Datastream, width: int) -> int:
+    """Find where the first `width` all-different characters in a row end.
+
+    Remembers the last place each character was seen, so this is one pass
+    with no copying, whatever the width. A file or iterator of chunks is read
+    a chunk at a time, only until the marker turns up, and the offset counts
+    from the start of the whole stream.
+    """
+    last_seen: Dict[Union[str, int], int] = {}
+    # The start of the longest run of all-different characters ending here
+    start = 0
+    offset = 0
+    for chunk in chunks_of(stream):
+        for i, e in enumerate(chunk, offset):
+            seen = last_seen.get(e, -1)
+            if seen >= start:
+                start = seen + 1
+            last_seen[e] = i
+            if i - start + 1 == width:
+                return i + 1
+        offset += len(chunk)
+    raise ValueError(f"no unique set of {width} consecutive characters in string")
+
+
+# BITS[c] is the bit for byte c in a window's mask of which bytes it has
+BITS = [1 << c for c in range(256)]
+
+
+def find_window_mask(s: Union[str, bytes], width: int) -> int:
+    """Same as find_window, for a whole str or bytes, skipping ahead on repeats.
+
+    Each window is checked from its right end, toggling each byte's bit into a
+    mask. As soon as a bit is already set, no window starting at or before
+    that repeat can work, so jump the window to just after it. Most of the
+    stream never gets looked at.
+    """
+    if isinstance(s, str):
+        s = s.encode()
+    i = 0
+    while i + width <= len(s):
+        mask = 0
+        for j in range(i + width - 1, i - 1, -1):
+            bit = BITS[s[j]]
+            if mask & bit:
+                i = j + 1
+                break
+            mask ^= bit
+        else:
+            return i + width
+    raise ValueError(f"no unique set of {width} consecutive characters in string")
+
+
+def find_markers(data: bytes, width: int) -> List[int]:
+    """Find the marker in each line of a whole file's worth of datastreams."""
+    return [find_window_mask(line, width) for line in data.splitlines()]
+
+
+def find_marker(stream: Datastream) -> int:
+    return find_window(stream, 4)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="treat the whole file as one datastream and read it in chunks",
+    )
 
     args = parser.parse_args()
     print("case 0 (should be 7):", find_marker("mjqjpqmgbljsphdztnvjfqwrcgsmlb"))
     print("case 1 (should be 5):", find_marker("bvwbjplbgvbhsrlpgdmjqwftvncz"))
     print("case 2 (should be 6):", find_marker("nppdvjthqldpwncqszvftbrmjlhg"))
     print()
-    with open(args.filename) as f:
-        for line in f:
-            print("from file:", find_marker(line))
+    if args.stream:
+        with open(args.filename, "rb") as bf:
+            print("from file:", find_marker(bf))
+    else:
+        with open(args.filename) as f:
+            for line in f:
+                print("from file:", find_marker(line))
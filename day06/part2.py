@@ -1,29 +1,32 @@
 import argparse
-from typing import List
 
+from part1 import Datastream, find_markers, find_window, find_window_mask
 
-def find_marker(s: str) -> int:
-    prev_chars: List[str] = []
-    for i, e in enumerate(s):
-        if len(prev_chars) < 14:
-            prev_chars.append(e)
-            continue
-        prev_chars.append(e)
-        prev_chars = prev_chars[1:]
-        if len(set(prev_chars)) == 14:
-            return i + 1
-    raise ValueError("no unique set of 14 consecutive characters in string")
+
+def find_marker(stream: Datastream) -> int:
+    if isinstance(stream, (str, bytes)):
+        return find_window_mask(stream, 14)
+    return find_window(stream, 14)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="treat the whole file as one datastream and read it in chunks",
+    )
 
     args = parser.parse_args()
     print("case 0 (should be 19):", find_marker("mjqjpqmgbljsphdztnvjfqwrcgsmlb"))
     print("case 1 (should be 23):", find_marker("bvwbjplbgvbhsrlpgdmjqwftvncz"))
     print("case 2 (should be 23):", find_marker("nppdvjthqldpwncqszvftbrmjlhg"))
     print()
-    with open(args.filename) as f:
-        for line in f:
-            print("from file:", find_marker(line))
+    if args.stream:
+        with open(args.filename, "rb") as bf:
+            print("from file:", find_marker(bf))
+    else:
+        with open(args.filename, "rb") as bf:
+            for marker in find_markers(bf.read(), 14):
+                print("from file:", marker)
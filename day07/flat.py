@@ -0,0 +1,145 @@
+"""A compact filesystem made of flat arrays instead of File/Directory objects."""
+from __future__ import annotations
+
+import argparse
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+from part1 import Command, _dir_re, _file_re, parse_file
+
+# No such node, for first_child and next_sibling
+NONE = -1
+
+
+class FlatFilesystem:
+    """A filesystem where each file or directory is a number into flat arrays.
+
+    Node 0 is the root. A node is always added after its parent, so going
+    through the nodes backwards visits every child before its parent.
+    """
+
+    def __init__(self):
+        self.parent = array("q", [NONE])
+        # For files, the file's size; for directories, the total of everything
+        # under it once sum_sizes() has run
+        self.size = array("q", [0])
+        self.is_dir = array("b", [1])
+        self.first_child = array("q", [NONE])
+        self.next_sibling = array("q", [NONE])
+        self.name_id = array("q", [0])
+        # Each distinct name is stored once
+        self.names: List[str] = ["/"]
+        self._name_ids: Dict[str, int] = {"/": 0}
+        # (directory, name) -> child directory, so cd doesn't scan siblings
+        self._subdirs: Dict[Tuple[int, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def name(self, node: int) -> str:
+        return self.names[self.name_id[node]]
+
+    def add(self, parent: int, name: str, size: int = 0, is_dir: bool = False) -> int:
+        """Add a node under parent and return its number."""
+        if name not in self._name_ids:
+            self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        node = len(self.parent)
+        self.parent.append(parent)
+        self.size.append(size)
+        self.is_dir.append(is_dir)
+        self.first_child.append(NONE)
+        self.next_sibling.append(self.first_child[parent])
+        self.name_id.append(self._name_ids[name])
+        self.first_child[parent] = node
+        if is_dir:
+            self._subdirs[parent, name] = node
+        return node
+
+    def children(self, node: int) -> Iterator[int]:
+        child = self.first_child[node]
+        while child != NONE:
+            yield child
+            child = self.next_sibling[child]
+
+    def cd(self, node: int, path: str) -> int:
+        """Get the directory at path, starting from node."""
+        if path.startswith("/"):
+            node = 0
+        for part in path.split("/"):
+            if part in ("", "."):
+                continue
+            if part == "..":
+                if self.parent[node] == NONE:
+                    raise RuntimeError("Can't cd .. out of the root directory")
+                node = self.parent[node]
+            else:
+                try:
+                    node = self._subdirs[node, part]
+                except KeyError:
+                    raise RuntimeError(
+                        f"Cannot find child {part} in children of directory"
+                        f" {self.name(node)}"
+                    ) from None
+        return node
+
+    @classmethod
+    def from_commands(cls, commands: List[Command]) -> FlatFilesystem:
+        """Same as do_commands, but building a FlatFilesystem."""
+        fs = cls()
+        current_dir = 0
+        for command in commands:
+            cmd = command.name
+            if cmd.startswith("$ cd"):
+                current_dir = fs.cd(current_dir, cmd.split()[-1])
+            elif cmd.startswith("$ ls"):
+                for line in command.output:
+                    if m := _dir_re.search(line):
+                        fs.add(current_dir, m.group(1), is_dir=True)
+                    elif m := _file_re.search(line):
+                        fs.add(current_dir, m.group(2), size=int(m.group(1)))
+                    else:
+                        raise RuntimeError(
+                            f"Not sure what to do with ls output line `{line}`"
+                        )
+            else:
+                raise RuntimeError(f"Not sure what to do with this command: {command}")
+        fs.sum_sizes()
+        return fs
+
+    def sum_sizes(self):
+        """Add every node's size into its parent's, children before parents."""
+        # Directories start from zero, so running this again is harmless
+        size = array("q", (0 if d else s for d, s in zip(self.is_dir, self.size)))
+        parent = self.parent
+        for node in range(len(parent) - 1, 0, -1):
+            size[parent[node]] += size[node]
+        self.size = size
+
+    def dir_sizes(self) -> Iterator[int]:
+        """Yield the size of every directory except the root."""
+        return (s for s, d in zip(self.size[1:], self.is_dir[1:]) if d)
+
+
+def do_part_1(fs: FlatFilesystem) -> int:
+    return sum(size for size in fs.dir_sizes() if size <= 100000)
+
+
+def do_part_2(fs: FlatFilesystem) -> int:
+    total_space = 70000000
+    need_space = 30000000
+
+    need_to_free = need_space - (total_space - fs.size[0])
+    return min(
+        (size for size in fs.dir_sizes() if size >= need_to_free), default=fs.size[0]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="read a file")
+    parser.add_argument("filename")  # positional argument
+
+    args = parser.parse_args()
+    fs = FlatFilesystem.from_commands(parse_file(args.filename))
+    print(do_part_1(fs))
+    print(do_part_2(fs))
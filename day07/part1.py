@@ -4,7 +4,17 @@ import argparse
 import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional, Union
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 
 @dataclass
@@ -25,25 +35,131 @@ class Directory:
     name: str
     children: List[Union[Directory, File]] = field(default_factory=list)
     parent: Optional[Directory] = None
+    # Cached total size; None until someone asks, or after it's out of date
+    _size: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    # children by name, kept up to date by add_child
+    _by_name: Dict[str, Union[Directory, File]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        for child in self.children:
+            self._by_name[child.name] = child
 
     @property
     def size(self) -> int:
-        return sum(c.size for c in self.children)
+        if self._size is None:
+            # Sum bottom-up without recursing, so deep trees are fine:
+            # in reverse pre-order, every directory comes after its children
+            order: List[Directory] = []
+            stack = [self]
+            while stack:
+                d = stack.pop()
+                order.append(d)
+                stack += (
+                    c
+                    for c in d.children
+                    if isinstance(c, Directory) and c._size is None
+                )
+            for d in reversed(order):
+                d._size = sum(
+                    c._size if isinstance(c, Directory) else c.size for c in d.children
+                )
+        assert self._size is not None
+        return self._size
+
+    def invalidate_size(self):
+        """Forget the cached size of this directory and everything above it.
+
+        Call this after changing `children` by hand; add_child does it for you.
+        """
+        d: Optional[Directory] = self
+        # A cached size means every directory under it is cached too,
+        # so once we find one that isn't, everything above it isn't either
+        while d is not None and d._size is not None:
+            d._size = None
+            d = d.parent
+
+    def add_child(self, child: Union[Directory, File]):
+        self.children.append(child)
+        self._by_name[child.name] = child
+        self.invalidate_size()
+
+    def child(self, name: str) -> Union[Directory, File]:
+        """Get a child by name.
+
+        If two children have the same name, this is the one added last.
+        """
+        try:
+            return self._by_name[name]
+        except KeyError:
+            pass
+        # Someone might have appended to `children` by hand
+        for child in reversed(self.children):
+            if child.name == name:
+                self._by_name[name] = child
+                return child
+        raise KeyError(f"Cannot find child {name} in children of directory {self}")
+
+    def root(self) -> Directory:
+        d = self
+        while d.parent is not None:
+            d = d.parent
+        return d
+
+    def resolve(self, path: str) -> Directory:
+        """Find the directory at a path.
+
+        Absolute paths start from the root; others start here.
+        """
+        d = self.root() if path.startswith("/") else self
+        for part in path.split("/"):
+            if part in ("", "."):
+                continue
+            if part == "..":
+                if d.parent is None:
+                    raise KeyError(f"{d.name} has no parent")
+                d = d.parent
+                continue
+            child = d.child(part)
+            if not isinstance(child, Directory):
+                raise KeyError(f"{part} in {path} is not a directory")
+            d = child
+        return d
+
+    def pretty_lines(self) -> Iterator[str]:
+        """Yield the lines of pretty(), one at a time, without recursing."""
+        stack: List[Tuple[int, Union[Directory, File]]] = [(0, self)]
+        while stack:
+            depth, node = stack.pop()
+            indent = "\t" * depth
+            if isinstance(node, File):
+                yield f"{indent}- {node.pretty()}"
+            else:
+                yield f"{indent}- {node.name} (dir)"
+                stack += ((depth + 1, c) for c in reversed(node.children))
 
     def _pretty(self) -> List[str]:
-        out: List[str] = []
-        out.append(f"- {self.name} (dir)")
-        for c in self.children:
-            if isinstance(c, File):
-                out.append(f"\t- {c.pretty()}")
-            else:
-                assert isinstance(c, Directory)
-                child_lines = [f"\t{l}" for l in c._pretty()]
-                out += child_lines
-        return out
+        return list(self.pretty_lines())
 
     def pretty(self) -> str:
-        return "\n".join(self._pretty())
+        return "\n".join(self.pretty_lines())
+
+    def write_pretty(self, f: TextIO):
+        """Write pretty() to a file a line at a time."""
+        for line in self.pretty_lines():
+            f.write(line)
+            f.write("\n")
+
+    def walk(self) -> Iterator[Directory]:
+        """Lazily yield every directory under this one (but not this one)."""
+        stack = [self]
+        while stack:
+            d = stack.pop()
+            for c in d.children:
+                if isinstance(c, Directory):
+                    yield c
+                    stack.append(c)
 
     def list_all_children(self) -> List[Directory]:
         """List all children.
@@ -52,10 +168,7 @@ class Directory:
         Ex. if this dir has a child 'X' that contains 'Y' and 'Z',
         then this list will contain X *and* Y *and* Z.
         """
-        children = [e for e in self.children if isinstance(e, Directory)]
-        for child in [e for e in self.children if isinstance(e, Directory)]:
-            children += child.list_all_children()
-        return children
+        return list(self.walk())
 
 
 @dataclass
@@ -98,31 +211,25 @@ def do_commands(commands: List[Command]) -> Directory:
             if cmd.startswith("$ cd .."):
                 assert current_dir.parent is not None
                 current_dir = current_dir.parent
-            elif cmd.startswith("$ cd /"):
-                current_dir = root
             else:
                 change_to = cmd.split()[-1]
-                changed = False
-                for child in current_dir.children:
-                    if child.name == change_to:
-                        assert isinstance(child, Directory)
-                        changed = True
-                        current_dir = child
-                if not changed:
+                try:
+                    current_dir = current_dir.resolve(change_to)
+                except KeyError:
                     raise RuntimeError(
                         f"Cannot find child {change_to} in children of directory"
                         f" {current_dir}"
-                    )
+                    ) from None
 
         # ls
         elif cmd.startswith("$ ls"):
             for line in command.output:
                 if m := _dir_re.search(line):
                     new_dir = Directory(name=m.group(1), parent=current_dir)
-                    current_dir.children.append(new_dir)
+                    current_dir.add_child(new_dir)
                 elif m := _file_re.search(line):
                     new_file = File(name=m.group(2), size=int(m.group(1)))
-                    current_dir.children.append(new_file)
+                    current_dir.add_child(new_file)
                 else:
                     raise RuntimeError(
                         f"Not sure what to do with ls output line `{line}`"
@@ -134,9 +241,95 @@ def do_commands(commands: List[Command]) -> Directory:
     return root
 
 
+def stream_dir_sizes(lines: Iterable[str]) -> Iterator[int]:
+    """Yield the total size of each directory as the log leaves it, root last.
+
+    A directory that's listed but never cd'd into comes out as 0 just before
+    the root, since we never see anything inside it.
+
+    Only a stack of the directories we're in is kept, plus a (parent id,
+    name) pair for each directory we've finished with; no Command, File or
+    Directory gets built. Like any real terminal session, this expects a
+    directory to be listed once and not come back after we cd out of it.
+    """
+    # names[i], ids[i] and sizes[i] are the i-th directory down from the root
+    names: List[str] = ["/"]
+    ids: List[int] = [0]
+    sizes: List[int] = [0]
+    next_id = 1
+    # (parent id, name) of every directory we've left
+    done: Set[Tuple[int, str]] = set()
+    # (parent id, name) of every listed directory we haven't gone into yet
+    listed: Set[Tuple[int, str]] = set()
+
+    def leave() -> int:
+        done.add((ids[-2], names.pop()))
+        ids.pop()
+        size = sizes.pop()
+        sizes[-1] += size
+        return size
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith("$ cd"):
+            change_to = line.split()[-1]
+            if change_to.startswith("/"):
+                # Only leave the directories that aren't on the way to change_to
+                target = [part for part in change_to.split("/") if part]
+                keep = 1
+                while (
+                    keep < len(names)
+                    and keep <= len(target)
+                    and names[keep] == target[keep - 1]
+                ):
+                    keep += 1
+                while len(names) > keep:
+                    yield leave()
+                change_to = "/".join(target[keep - 1 :])
+            for part in change_to.split("/"):
+                if part in ("", "."):
+                    continue
+                if part == "..":
+                    if len(names) == 1:
+                        raise RuntimeError("Can't cd .. out of the root directory")
+                    yield leave()
+                    continue
+                if (ids[-1], part) in done:
+                    raise RuntimeError(f"Already left {'/'.join(names + [part])[1:]}")
+                listed.discard((ids[-1], part))
+                names.append(part)
+                ids.append(next_id)
+                next_id += 1
+                sizes.append(0)
+        elif line.startswith("$ ls") or line == "":
+            continue
+        elif m := _dir_re.match(line):
+            listed.add((ids[-1], m.group(1)))
+        elif m := _file_re.match(line):
+            sizes[-1] += int(m.group(1))
+        else:
+            raise RuntimeError(f"Not sure what to do with this line: {line}")
+    while len(names) > 1:
+        yield leave()
+    for _ in listed:
+        yield 0
+    yield sizes[0]
+
+
+def stream_parts(filename: str) -> Tuple[int, int]:
+    """Same as do_part_1 and do_part_2, from one streaming pass over the log."""
+    with open(filename) as f:
+        dir_sizes = list(stream_dir_sizes(f))
+    # The root comes out last, and part 1 doesn't count it
+    root_size = dir_sizes[-1]
+    part_1 = sum(size for size in dir_sizes[:-1] if size <= 100000)
+    need_to_free = root_size - (70000000 - 30000000)
+    part_2 = min(size for size in dir_sizes if size >= need_to_free)
+    return part_1, part_2
+
+
 def do_part_1(root_dir: Directory) -> int:
-    all_dirs = root_dir.list_all_children()
-    return sum(d.size for d in all_dirs if d.size <= 100000)
+    return sum(d.size for d in root_dir.walk() if d.size <= 100000)
 
 
 def do_part_2(root_dir: Directory) -> int:
@@ -146,7 +339,7 @@ def do_part_2(root_dir: Directory) -> int:
     current_free_space = total_space - root_dir.size
 
     best_dir = root_dir
-    for d in root_dir.list_all_children():
+    for d in root_dir.walk():
         if current_free_space + d.size >= need_space:
             if d.size < best_dir.size:
                 best_dir = d
@@ -157,9 +350,18 @@ def do_part_2(root_dir: Directory) -> int:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="read a file")
     parser.add_argument("filename")  # positional argument
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="add up directory sizes while reading, without building the tree",
+    )
 
     args = parser.parse_args()
-    cmds = parse_file(args.filename)
-    root = do_commands(cmds)
-    print(do_part_1(root))
-    print(do_part_2(root))
+    if args.stream:
+        for answer in stream_parts(args.filename):
+            print(answer)
+    else:
+        cmds = parse_file(args.filename)
+        root = do_commands(cmds)
+        print(do_part_1(root))
+        print(do_part_2(root))